@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-16 02:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('batches', '0002_make_price_optional'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='batch',
+            index=models.Index(fields=['-supply_date', '-created_at'], name='batch_supply_date_idx'),
+        ),
+    ]
@@ -87,6 +87,9 @@ class Batch(UserTrackingModel):
     class Meta:
         ordering = ['-supply_date', '-created_at']
         verbose_name_plural = "Batches"
+        indexes = [
+            models.Index(fields=['-supply_date', '-created_at'], name='batch_supply_date_idx'),
+        ]
     
     def __str__(self):
         """Return batch ID."""
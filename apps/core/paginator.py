@@ -0,0 +1,54 @@
+"""
+Core Pagination
+
+Provides a Paginator that avoids the COUNT(*) query whenever the requested
+page already reveals the total.
+
+Classes:
+    CountSkippingPaginator: Drop-in Paginator for ListView.paginator_class.
+"""
+
+from django.core.paginator import Paginator
+
+
+class CountSkippingPaginator(Paginator):
+    """
+    Paginator that derives the total from a short page instead of counting.
+
+    How it works:
+        1. Fetches the requested page plus one extra row in a single query.
+        2. If the page comes back short, it is the last page, so the total is
+           the rows before it plus the rows on it; no COUNT(*) is issued.
+        3. If the page is full, the total is counted as usual and the rows
+           already fetched are reused for the page.
+
+    Filtered lists (searches, status filters) usually fit on one page, so
+    they cost a single query. Requests this can't shortcut (orphans,
+    non-integer or out-of-range page numbers) fall back to Paginator.page().
+    """
+
+    def page(self, number):
+        """
+        Return a Page object for the given 1-based page number.
+
+        Args:
+            number (int): Page number as passed by ListView.
+
+        Returns:
+            Page: The requested page.
+        """
+        if self.orphans or 'count' in self.__dict__ or not isinstance(number, int) or number < 1:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+
+        if len(rows) > self.per_page:
+            # Full page with more after it: the page count needs the real total
+            self.validate_number(number)
+            return self._get_page(rows[:self.per_page], number, self)
+        if rows or (number == 1 and self.allow_empty_first_page):
+            # Short (or empty first) page: this is the end of the list
+            self.count = bottom + len(rows)
+            return self._get_page(rows, number, self)
+        return super().page(number)
@@ -0,0 +1,12 @@
+"""
+Core Test Helpers
+
+Settings shared by the test suites of all apps.
+
+Constants:
+- FAST_PASSWORD_HASHERS: For @override_settings(PASSWORD_HASHERS=...) on
+  TestCase classes that create users. The production hashers are
+  deliberately slow; tests only need a valid user.
+"""
+
+FAST_PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
@@ -12,11 +12,12 @@ Test Categories:
 
 from decimal import Decimal
 from datetime import date
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
 
+from apps.core.testing import FAST_PASSWORD_HASHERS
 from apps.expenses.models import Expense
 
 User = get_user_model()
@@ -26,6 +27,7 @@ User = get_user_model()
 # EXPENSE SUCCESS MESSAGE TESTS
 # =============================================================================
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class ExpenseCreateSuccessMessageTests(TestCase):
     """Test success messages for expense creation."""
     
@@ -132,33 +134,34 @@ class ExpenseCreateSuccessMessageTests(TestCase):
         self.assertContains(response, 'created successfully')
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class ExpenseUpdateSuccessMessageTests(TestCase):
     """Test success messages for expense updates."""
     
     @classmethod
     def setUpTestData(cls):
-        """Create test user."""
+        """Create test user and the expense shared by every test (rolled back per test)."""
         cls.user = User.objects.create_user(
             email='expenseupdate@example.com',
             password='testpass123',
             first_name='Expense',
             last_name='Updater'
         )
-    
-    def setUp(self):
-        """Set up client and create expense for each test."""
-        self.client = Client()
-        self.client.login(email='expenseupdate@example.com', password='testpass123')
         
-        self.expense = Expense.objects.create(
+        cls.expense = Expense.objects.create(
             item='Original Expense',
             cost=Decimal('10000.00'),
             expense_date=date(2026, 1, 15),
             notes='Original notes',
-            created_by=self.user,
-            modified_by=self.user
+            created_by=cls.user,
+            modified_by=cls.user
         )
     
+    def setUp(self):
+        """Set up client."""
+        self.client = Client()
+        self.client.login(email='expenseupdate@example.com', password='testpass123')
+    
     def test_success_message_on_expense_update(self):
         """Test that success message is shown after updating an expense."""
         response = self.client.post(
@@ -242,6 +245,7 @@ class ExpenseUpdateSuccessMessageTests(TestCase):
         self.assertIn('updated successfully', str(messages[0]))
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class ExpenseSuccessMessageEdgeCaseTests(TestCase):
     """Test edge cases for expense success messages."""
     
@@ -15,7 +15,7 @@ from django.db.models import Sum, F, Q
 from django.db.models.functions import Coalesce
 from django.views.generic import TemplateView
 
-from apps.sales.models import Sale, Payment
+from apps.sales.models import Sale
 from apps.expenses.models import Expense
 from apps.batches.models import Batch
 
@@ -105,9 +105,14 @@ class StatisticsView(LoginRequiredMixin, TemplateView):
             batches_qs = batches_qs.filter(supply_date__gte=date_from, supply_date__lte=date_to)
         
         # Calculate totals
-        total_sales = sales_qs.aggregate(
-            total=Coalesce(Sum('total_price'), Decimal('0'))
-        )['total']
+        # Sales total and amount collected come from one query; each sale
+        # stores the running total of its payments in 'amount_paid'.
+        sales_totals = sales_qs.aggregate(
+            total=Coalesce(Sum('total_price'), Decimal('0')),
+            collected=Coalesce(Sum('amount_paid'), Decimal('0')),
+        )
+        total_sales = sales_totals['total']
+        sales_collected = sales_totals['collected']
         
         total_expenses = expenses_qs.aggregate(
             total=Coalesce(Sum('cost'), Decimal('0'))
@@ -121,18 +126,6 @@ class StatisticsView(LoginRequiredMixin, TemplateView):
             )
         )['total']
         
-        # Sales collected (sum of payments for sales in date range)
-        if date_from and date_to:
-            payments_qs = Payment.objects.filter(
-                sale__in=sales_qs
-            )
-        else:
-            payments_qs = Payment.objects.all()
-        
-        sales_collected = payments_qs.aggregate(
-            total=Coalesce(Sum('amount'), Decimal('0'))
-        )['total']
-        
         # Sales pending = total sales - collected
         sales_pending = total_sales - sales_collected
         
@@ -9,6 +9,7 @@ Classes:
 """
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from .models import Sale, Payment
 
 
@@ -20,6 +21,22 @@ class PaymentInline(admin.TabularInline):
     extra = 0
     readonly_fields = ['created_by', 'payment_date']
     can_delete = False
+    
+    def get_queryset(self, request):
+        """Load each payment's creator with the payments, not once per row."""
+        return super().get_queryset(request).select_related('created_by')
+
+
+class SaleChangeList(ChangeList):
+    """
+    Changelist that skips the free-text columns of sales.
+    
+    The list shows no related objects, so the joins added by
+    SaleAdmin.get_queryset (needed by the change form) are dropped here.
+    """
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        return queryset.select_related(None).defer('notes', 'deleted_reason')
 
 
 @admin.register(Sale)
@@ -31,16 +48,33 @@ class SaleAdmin(admin.ModelAdmin):
         - Shows soft-deleted sales (via get_queryset override).
         - Filters by wholesale status, payment status.
         - Detailed search on customer and notes.
+        - Changelist skips the free-text columns (SaleChangeList).
     """
     list_display = ['id', 'customer_name', 'total_price', 'payment_status', 'is_deleted', 'sale_date']
     list_filter = ['payment_status', 'is_deleted', 'sale_date', 'is_wholesale']
     search_fields = ['customer_name', 'notes']
-    readonly_fields = ['created_at', 'modified_at', 'created_by', 'modified_by', 'deleted_at', 'deleted_by']
+    readonly_fields = ['amount_paid', 'created_at', 'modified_at', 'created_by', 'modified_by', 'deleted_at', 'deleted_by']
     inlines = [PaymentInline]
+    list_per_page = 50
     
     def get_queryset(self, request):
-        """Override to show all objects, including soft-deleted ones, for admin oversight."""
-        return self.model.all_objects.all()
+        """
+        Override to show all objects, including soft-deleted ones, for admin oversight.
+        
+        Joins the users shown as read-only fields on the change form; the
+        editable batch/customer selects load their own choices anyway.
+        """
+        return self.model.all_objects.select_related('created_by', 'modified_by', 'deleted_by')
+    
+    def get_changelist(self, request, **kwargs):
+        return SaleChangeList
+
+
+class PaymentChangeList(ChangeList):
+    """Changelist that skips the free-text columns of payments and their sales."""
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        return queryset.defer('notes', 'sale__notes', 'sale__deleted_reason')
 
 
 @admin.register(Payment)
@@ -48,4 +82,9 @@ class PaymentAdmin(admin.ModelAdmin):
     """Standard admin for Payment records."""
     list_display = ['id', 'sale', 'amount', 'payment_method', 'payment_date', 'created_by']
     list_filter = ['payment_method', 'payment_date']
+    list_select_related = ['sale', 'created_by']
     readonly_fields = ['payment_date', 'created_by']
+    list_per_page = 50
+    
+    def get_changelist(self, request, **kwargs):
+        return PaymentChangeList
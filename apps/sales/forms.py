@@ -6,6 +6,7 @@ This module handles Sales and Payment data entry forms.
 Forms:
 - SaleForm: Main transaction form with HTMX autocomplete.
 - PaymentForm: For adding portions of payment with validation.
+- validate_payment_amount: Balance check shared by PaymentForm.
 - ArchiveSaleForm: Captures reason for soft-deleting a sale.
 """
 
@@ -20,6 +21,7 @@ class SaleForm(forms.ModelForm):
     
     Features:
         - HTMX Autocomplete: 'customer_name' field polls /customers/autocomplete/
+          (150ms debounce, from 2 characters).
         - Dynamic Batch Filtering: Shows available batches.
         - Numeric Keypads: Uses 'inputmode' for mobile friendliness.
     """
@@ -34,8 +36,15 @@ class SaleForm(forms.ModelForm):
         widgets = {
             'customer_name': forms.TextInput(attrs={
                 'hx-get': '/customers/autocomplete/',
-                'hx-trigger': 'keyup changed delay:500ms',
+                'hx-trigger': 'keyup changed delay:150ms',
+                'hx-params': 'customer_name',
                 'hx-target': '#customer-results',
+                # Don't search on fewer than 2 characters; clear stale results instead
+                'hx-on:htmx:config-request': (
+                    "if (this.value.trim().length < 2) {"
+                    " event.preventDefault();"
+                    " document.getElementById('customer-results').innerHTML = ''; }"
+                ),
                 'autocomplete': 'off',
                 'class': 'mt-1 block w-full rounded-md border border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm px-3 py-2',
                 'placeholder': 'Enter customer name'
@@ -59,7 +68,23 @@ class SaleForm(forms.ModelForm):
         """Initialize form and filter batch queryset."""
         super().__init__(*args, **kwargs)
         # Only show batches with stock available (simplified logic)
-        self.fields['batch'].queryset = Batch.objects.all().order_by('-supply_date')
+        # The dropdown labels with batch_id, so that is the only column loaded.
+        self.fields['batch'].queryset = Batch.objects.only('id', 'batch_id').order_by('-supply_date')
+
+
+def validate_payment_amount(amount, balance_due):
+    """
+    Reject a payment that is larger than what is still owed on a sale.
+    
+    Args:
+        amount (Decimal): The payment being recorded.
+        balance_due (Decimal): Outstanding balance on the sale.
+        
+    Raises:
+        ValidationError: If amount > balance_due.
+    """
+    if amount > balance_due:
+        raise forms.ValidationError(f"Amount exceeds balance due (₦{balance_due})")
 
 
 class PaymentForm(forms.ModelForm):
@@ -100,8 +125,7 @@ class PaymentForm(forms.ModelForm):
         """
         amount = self.cleaned_data['amount']
         if self.sale:
-            if amount > self.sale.amount_due:
-                raise forms.ValidationError(f"Amount exceeds balance due (₦{self.sale.amount_due})")
+            validate_payment_amount(amount, self.sale.amount_due)
         return amount
 
 
@@ -0,0 +1,18 @@
+"""
+Recompute the stored amount_paid and payment_status of every sale.
+
+Payment signals keep these columns current; this command is for repairing
+them after payments were changed outside the ORM (raw SQL, bulk updates).
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.sales.models import Sale
+
+
+class Command(BaseCommand):
+    help = "Recompute amount_paid and payment_status for all sales from their payments."
+
+    def handle(self, *args, **options):
+        count = Sale.reconcile_payment_status()
+        self.stdout.write(self.style.SUCCESS(f"Corrected payment totals for {count} sales."))
@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-16 02:49
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_amount_paid(apps, schema_editor):
+    """Populate amount_paid from existing payments."""
+    Sale = apps.get_model('sales', 'Sale')
+    Payment = apps.get_model('sales', 'Payment')
+    paid_per_sale = Payment.objects.filter(
+        sale=OuterRef('pk')
+    ).order_by().values('sale').annotate(
+        total=Sum('amount')
+    ).values('total')
+    Sale.objects.update(
+        amount_paid=Coalesce(Subquery(paid_per_sale), Decimal('0'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sale',
+            name='amount_paid',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, help_text='Sum of payments, maintained by Payment signals', max_digits=10),
+        ),
+        migrations.RunPython(backfill_amount_paid, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-16 02:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('batches', '0003_batch_supply_date_idx'),
+        ('customers', '0001_initial'),
+        ('sales', '0002_sale_amount_paid'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-sale_date', '-sale_time'], name='sale_active_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['payment_status'], name='sale_active_status_idx'),
+        ),
+    ]
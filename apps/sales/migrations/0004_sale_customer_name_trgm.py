@@ -0,0 +1,43 @@
+"""
+Trigram index backing the sale list's customer-name search.
+
+SaleListView filters with customer_name__icontains, which PostgreSQL runs as
+UPPER("customer_name"::text) LIKE UPPER('%term%'). A leading wildcard can't
+use a btree, so the index is a pg_trgm GIN index over that exact expression,
+limited to active rows like the other sale indexes.
+
+Trigram indexes are PostgreSQL-only; on SQLite (development/tests) both
+directions are no-ops.
+"""
+
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    """Enable pg_trgm and index the upper-cased customer name."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS sale_cname_trgm ON sales_sale '
+        'USING gin ((UPPER(customer_name::text)) gin_trgm_ops) '
+        'WHERE NOT is_deleted'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    """Drop the index; the extension is left in place for other users."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS sale_cname_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0003_sale_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-16 03:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('batches', '0003_batch_supply_date_idx'),
+        ('customers', '0001_initial'),
+        ('sales', '0004_sale_customer_name_trgm'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['-deleted_at'], name='sale_archived_idx'),
+        ),
+    ]
@@ -6,6 +6,8 @@ This module handles Sales transactions, Payments, and logical status updates.
 Business Logic:
 - A Sale represents a transaction with a Customer for a specific quantity of honey from a Batch.
 - Sales have a computed 'payment_status' (UNPAID, PARTIAL, PAID) based on associated Payments.
+- 'amount_paid' is stored on the Sale and kept current by Payment signals, so reading
+  a sale's balance never needs to aggregate its payments.
 - Sales can be 'soft-deleted' (archived) to preserve audit trails while hiding them from main reports.
 - Customers can be auto-created during sale creation if they don't exist.
 
@@ -14,13 +16,58 @@ Models:
 - Payment: Individual payments against a Sale.
 """
 
-from django.db import models
-from django.db.models import Sum, Q
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Sum, Q, F, Value, Case, When, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import Exact, GreaterThanOrEqual
 from django.utils import timezone
+from django.contrib.contenttypes.models import ContentType
 from apps.core.models import UserTrackingModel
+from apps.batches.models import AuditLog
 
 
-class SaleManager(models.Manager):
+def payment_status_expression(paid):
+    """
+    SQL equivalent of Sale.calculate_payment_status().
+    
+    Args:
+        paid (Expression): The amount paid, e.g. F('amount_paid') + delta.
+    
+    Returns:
+        Case: Evaluates to 'UNPAID', 'PAID' or 'PARTIAL' for each row.
+    """
+    return Case(
+        When(Exact(paid, 0), then=Value('UNPAID')),
+        When(GreaterThanOrEqual(paid, F('total_price')), then=Value('PAID')),
+        default=Value('PARTIAL'),
+    )
+
+
+class SaleQuerySet(models.QuerySet):
+    """
+    QuerySet for Sale with bulk payment bookkeeping.
+    
+    Methods:
+        with_totals(): Annotates 'balance_due' so the balance can be filtered
+            and ordered on in SQL.
+        apply_payment(delta): Adjusts the stored 'amount_paid' and 'payment_status'
+            of every sale in the queryset with a single UPDATE.
+    """
+    def with_totals(self):
+        # Named balance_due because amount_due is a read-only property on Sale
+        return self.annotate(balance_due=F('total_price') - F('amount_paid'))
+    
+    def apply_payment(self, delta):
+        paid = F('amount_paid') + Value(delta)
+        return self.update(
+            amount_paid=paid,
+            payment_status=payment_status_expression(paid),
+        )
+
+
+class SaleManager(models.Manager.from_queryset(SaleQuerySet)):
     """
     Default manager for Sale model.
     
@@ -32,7 +79,7 @@ class SaleManager(models.Manager):
         return super().get_queryset().filter(is_deleted=False)
 
 
-class ArchivedSaleManager(models.Manager):
+class ArchivedSaleManager(models.Manager.from_queryset(SaleQuerySet)):
     """
     Manager to retrieve only soft-deleted sales.
     
@@ -56,6 +103,7 @@ class Sale(UserTrackingModel):
         total_price (DecimalField): Auto-calculated (unit_price * quantity).
         batch (Batch): Inventory source.
         payment_status (CharField): UNPAID, PARTIAL, or PAID.
+        amount_paid (DecimalField): Running total of related Payments.
         is_wholesale (bool): Flag for bulk pricing/logic.
         
         is_deleted (bool): Soft-delete flag.
@@ -63,7 +111,6 @@ class Sale(UserTrackingModel):
         deleted_reason (TextField): Why it was deleted.
     
     Computed Properties:
-        amount_paid: Sum of all related payments.
         amount_due: total_price - amount_paid.
     """
     
@@ -80,6 +127,12 @@ class Sale(UserTrackingModel):
         ('PARTIAL', 'Partial Payment'),
     ]
     
+    # Columns written by soft_delete() and restore()
+    SOFT_DELETE_FIELDS = [
+        'is_deleted', 'deleted_at', 'deleted_by', 'deleted_reason',
+        'modified_at', 'modified_by',
+    ]
+    
     # Customer information
     customer = models.ForeignKey(
         'customers.Customer',
@@ -110,6 +163,13 @@ class Sale(UserTrackingModel):
         choices=PAYMENT_STATUS_CHOICES,
         default='UNPAID'
     )
+    amount_paid = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        help_text="Sum of payments, maintained by Payment signals"
+    )
     
     is_wholesale = models.BooleanField(default=False)
     notes = models.TextField(blank=True)
@@ -132,24 +192,58 @@ class Sale(UserTrackingModel):
     # Managers
     objects = SaleManager()
     archived = ArchivedSaleManager()
-    all_objects = models.Manager()  # Access to everything (active + deleted)
+    all_objects = SaleQuerySet.as_manager()  # Access to everything (active + deleted)
     
     class Meta:
         ordering = ['-sale_date', '-sale_time']
+        # Partial indexes: the default manager always filters is_deleted=False.
+        # customer_id is already indexed as a ForeignKey. The customer_name
+        # search is backed by a PostgreSQL-only trigram index created in
+        # migration 0004 (sale_cname_trgm).
+        indexes = [
+            models.Index(
+                fields=['-sale_date', '-sale_time'],
+                condition=Q(is_deleted=False),
+                name='sale_active_date_idx',
+            ),
+            models.Index(
+                fields=['payment_status'],
+                condition=Q(is_deleted=False),
+                name='sale_active_status_idx',
+            ),
+            # The archived list (Sale.archived, newest deletion first)
+            models.Index(
+                fields=['-deleted_at'],
+                condition=Q(is_deleted=True),
+                name='sale_archived_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"Sale #{self.id} - {self.customer_name}"
     
-    @property
-    def amount_paid(self):
+    @classmethod
+    def from_db(cls, db, field_names, values):
         """
-        Calculate the total amount paid so far.
+        Keep a snapshot of the values as loaded, keyed by attname.
         
-        Returns:
-            Decimal: Sum of all related Payment records.
+        'track_sale_changes' diffs against this snapshot instead of
+        re-fetching the row before every save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None):
         """
-        total = self.payments.aggregate(Sum('amount'))['amount__sum']
-        return total or 0
+        Reload fields from the database and re-sync the change-tracking snapshot.
+        
+        Without this, a sale refreshed after its row changed elsewhere (e.g. a
+        payment updating its status) would keep diffing against the values it
+        was first loaded with, and audit those changes a second time.
+        """
+        super().refresh_from_db(using=using, fields=fields)
+        self._sync_loaded_values(fields)
     
     @property
     def amount_due(self):
@@ -161,23 +255,137 @@ class Sale(UserTrackingModel):
         """
         return self.total_price - self.amount_paid
     
-    def update_payment_status(self):
+    def calculate_payment_status(self):
         """
-        Recalculate and update 'payment_status' based on current payments.
+        Derive the payment status from 'amount_paid'.
         
         Logic:
             - If paid == 0 -> UNPAID
             - If paid >= total -> PAID
             - Else -> PARTIAL
+        
+        Returns:
+            str: One of the PAYMENT_STATUS_CHOICES keys.
         """
         paid = self.amount_paid
         if paid == 0:
-            self.payment_status = 'UNPAID'
+            return 'UNPAID'
         elif paid >= self.total_price:
-            self.payment_status = 'PAID'
-        else:
-            self.payment_status = 'PARTIAL'
-        self.save()
+            return 'PAID'
+        return 'PARTIAL'
+    
+    def apply_payment(self, delta):
+        """
+        Add 'delta' to the stored amount paid (negative when a payment is removed).
+        
+        The row is updated with F() expressions so concurrent payments can't
+        overwrite each other; this instance is updated to match.
+        
+        Args:
+            delta (Decimal): Change in the total paid against this sale.
+        """
+        Sale.all_objects.filter(pk=self.pk).apply_payment(delta)
+        self.amount_paid += delta
+        self.payment_status = self.calculate_payment_status()
+        self._payment_totals_saved()
+    
+    def update_payment_status(self):
+        """
+        Recalculate 'amount_paid' from the Payment records and update 'payment_status'.
+        
+        Payment signals keep both fields current; this is the full rebuild used
+        when they may have drifted (e.g. payments written with bulk_create).
+        Written with a single UPDATE (no save() or pre_save diff); a status
+        change is still recorded in the Audit Log.
+        """
+        old_status = self.payment_status
+        self.amount_paid = self.payments.aggregate(Sum('amount'))['amount__sum'] or 0
+        self.payment_status = self.calculate_payment_status()
+        Sale.all_objects.filter(pk=self.pk).update(
+            amount_paid=self.amount_paid,
+            payment_status=self.payment_status,
+        )
+        self._payment_totals_saved()
+        self.log_payment_status_change(old_status)
+    
+    def _payment_totals_saved(self):
+        """Mark the stored payment totals as the change-tracking baseline."""
+        if hasattr(self, '_loaded_values'):
+            self._loaded_values.update(
+                amount_paid=self.amount_paid,
+                payment_status=self.payment_status,
+            )
+    
+    def log_payment_status_change(self, old_status):
+        """
+        Record a 'payment_status' change that was written without save().
+        
+        Attributed to the acting user when there is one, otherwise to the
+        sale's last modifier.
+        
+        Args:
+            old_status (str): The status before the update.
+        """
+        entry = self._payment_status_audit_entry(old_status)
+        if entry:
+            entry.save()
+    
+    def _payment_status_audit_entry(self, old_status):
+        """Build the unsaved AuditLog for a status change, or None if unchanged."""
+        if self.payment_status == old_status:
+            return None
+        from apps.core.middleware import get_current_user
+        user = get_current_user()
+        changed_by_id = user.pk if user and user.is_authenticated else self.modified_by_id
+        return AuditLog(
+            content_type_id=ContentType.objects.get_for_model(Sale).pk,
+            object_id=self.pk,
+            field_name='payment_status',
+            old_value=old_status,
+            new_value=self.payment_status,
+            changed_by_id=changed_by_id
+        )
+    
+    @classmethod
+    def reconcile_payment_status(cls):
+        """
+        Recompute 'amount_paid' and 'payment_status' of all sales from their payments.
+        
+        Totals and statuses are computed in one query and only sales whose
+        stored values differ are written (bulk_update). Status changes are
+        recorded in the Audit Log.
+        
+        Returns:
+            int: Number of sales corrected.
+        """
+        paid_per_sale = Payment.objects.filter(
+            sale=OuterRef('pk')
+        ).order_by().values('sale').annotate(
+            total=Sum('amount')
+        ).values('total')
+        
+        drifted = cls.all_objects.annotate(
+            paid=Coalesce(Subquery(paid_per_sale), Decimal('0')),
+        ).annotate(
+            new_status=payment_status_expression(F('paid')),
+        ).exclude(
+            amount_paid=F('paid'), payment_status=F('new_status'),
+        ).only('id', 'total_price', 'amount_paid', 'payment_status', 'modified_by')
+        
+        sales = list(drifted)
+        entries = []
+        for sale in sales:
+            old_status = sale.payment_status
+            sale.amount_paid = sale.paid
+            sale.payment_status = sale.new_status
+            entry = sale._payment_status_audit_entry(old_status)
+            if entry:
+                entries.append(entry)
+        
+        with transaction.atomic():
+            cls.all_objects.bulk_update(sales, ['amount_paid', 'payment_status'], batch_size=500)
+            AuditLog.objects.bulk_create(entries)
+        return len(sales)
     
     def soft_delete(self, user, reason):
         """
@@ -191,7 +399,7 @@ class Sale(UserTrackingModel):
         self.deleted_at = timezone.now()
         self.deleted_by = user
         self.deleted_reason = reason
-        self.save()
+        self.save(update_fields=self.SOFT_DELETE_FIELDS)
 
     def restore(self):
         """Undo soft-delete and restore to active state."""
@@ -199,7 +407,7 @@ class Sale(UserTrackingModel):
         self.deleted_at = None
         self.deleted_by = None
         self.deleted_reason = ""
-        self.save()
+        self.save(update_fields=self.SOFT_DELETE_FIELDS)
     
     def save(self, *args, **kwargs):
         """
@@ -207,14 +415,24 @@ class Sale(UserTrackingModel):
         
         Hooks:
             1. Auto-calculates total_price (unit_price * quantity).
-            2. Auto-creates Customer if 'customer_name' is provided but 'customer' FK is null.
+            2. Auto-creates Customer if 'customer_name' is provided but 'customer' FK is null
+               (skipped when 'customer_name' hasn't changed since the sale was loaded).
         """
         # Auto-calculate total_price
         if self.unit_price and self.quantity:
             self.total_price = self.unit_price * self.quantity
         
-        # Auto-create customer if needed
-        if self.customer_name and not self.customer:
+        # Auto-create customer if needed, only when the name was just set or
+        # changed (customer_id avoids loading the related row)
+        update_fields = kwargs.get('update_fields')
+        loaded_values = getattr(self, '_loaded_values', None)
+        customer_name_changed = (
+            self._state.adding
+            or loaded_values is None
+            or loaded_values.get('customer_name') != self.customer_name
+        ) and (update_fields is None or 'customer_name' in update_fields)
+        
+        if self.customer_name and not self.customer_id and customer_name_changed:
             from apps.customers.models import Customer
             
             # We need to find or create customer
@@ -238,6 +456,28 @@ class Sale(UserTrackingModel):
             self.customer = customer
         
         super().save(*args, **kwargs)
+        
+        # The saved values are the new baseline for change tracking
+        if update_fields is None:
+            self._loaded_values = {}
+        self._sync_loaded_values(update_fields)
+    
+    def _sync_loaded_values(self, field_names=None):
+        """
+        Copy current field values into the change-tracking snapshot.
+        
+        Args:
+            field_names (iterable): Names or attnames to copy; all loaded
+                fields when None. No-op for sales without a snapshot.
+        """
+        if not hasattr(self, '_loaded_values'):
+            return
+        deferred = self.get_deferred_fields()
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred:
+                continue
+            if field_names is None or field.name in field_names or field.attname in field_names:
+                self._loaded_values[field.attname] = getattr(self, field.attname)
 
 
 class Payment(models.Model):
@@ -284,11 +524,25 @@ class Payment(models.Model):
         ordering = ['-payment_date']
     
     def __str__(self):
-        return f"₦{self.amount} for Sale #{self.sale.id}"
+        return f"₦{self.amount} for Sale #{self.sale_id}"
     
     def save(self, *args, **kwargs):
-        """Auto-assign currently logged-in user to 'created_by'."""
-        if not self.pk and not hasattr(self, 'created_by'):
+        """
+        Auto-assign currently logged-in user to 'created_by'.
+        
+        Also remembers the sale/amount this payment had before an edit, so the
+        post_save signal can move only the difference onto the Sale totals.
+        The amount is normalized to a Decimal first (e.g. '5' from a script),
+        since the signal adds it to amount_paid in an F() expression.
+        """
+        self.amount = self._meta.get_field('amount').to_python(self.amount)
+        self._previous_sale_amount = None
+        if self.pk:
+            self._previous_sale_amount = Payment.objects.filter(
+                pk=self.pk
+            ).values_list('sale_id', 'amount').first()
+        # created_by_id avoids the RelatedObjectDoesNotExist raised by an unset FK
+        if not self.pk and self.created_by_id is None:
              from apps.core.middleware import get_current_user
              user = get_current_user()
              if user and user.is_authenticated:
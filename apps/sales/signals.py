@@ -4,32 +4,121 @@ Sales Signals
 This module manages automated updates for Sales.
 
 Signals:
-- update_sale_payment_status: Ensures Sale status (PAID/UNPAID) matches real-time payments.
+- update_sale_payment_status: Keeps Sale amount_paid and status (PAID/UNPAID) in step with payments.
 - track_sale_changes: Audits changes to critical sale terms.
+
+Functions:
+- deferred_sale_totals: Context manager that applies payment changes once per sale on exit.
 """
 
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
 from .models import Payment, Sale
 from apps.batches.models import AuditLog
 
+# Thread-local buffer of {sale_id: delta} while deferred_sale_totals() is active
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_sale_totals():
+    """
+    Collect Payment changes and apply them with one UPDATE per sale on exit.
+    
+    Inside the block, Sale totals are not updated as payments are saved or
+    deleted; use it when writing many payments at once (imports, scripts).
+    Nested blocks join the outermost one.
+    
+    Usage:
+        with transaction.atomic(), deferred_sale_totals():
+            for row in rows:
+                Payment.objects.create(...)
+    """
+    if getattr(_deferred, 'deltas', None) is not None:
+        yield
+        return
+    
+    _deferred.deltas = defaultdict(int)
+    try:
+        yield
+        deltas = _deferred.deltas
+    finally:
+        _deferred.deltas = None
+    
+    sales = Sale.all_objects.in_bulk([sale_id for sale_id, delta in deltas.items() if delta])
+    for sale_id, sale in sales.items():
+        _apply_payment_delta(sale, deltas[sale_id])
+
+
+def _apply_payment_delta(sale, delta):
+    """
+    Apply a change in amount paid to a sale and audit any status transition.
+    
+    Args:
+        sale (Sale): The sale to update (updated in place as well).
+        delta (Decimal): Change in the total paid against the sale.
+    """
+    old_status = sale.payment_status
+    sale.apply_payment(delta)
+    sale.log_payment_status_change(old_status)
+
 
 @receiver(post_save, sender=Payment)
 @receiver(post_delete, sender=Payment)
-def update_sale_payment_status(sender, instance, **kwargs):
+def update_sale_payment_status(sender, instance, signal, **kwargs):
     """
-    Trigger re-calculation of Sale payment status whenever a Payment is saved or deleted.
+    Apply a saved or deleted Payment to its Sale's stored totals.
+    
+    Only the change in amount is applied (one UPDATE, no re-aggregation). An
+    edited payment that moved to another sale is taken off the old sale first.
+    Status transitions are still recorded in the Audit Log. Inside
+    deferred_sale_totals() the change is buffered instead.
+    
+    Fixture loading (raw saves) is skipped: the fixture's Sale rows already
+    carry the stored totals.
     
     Args:
         sender: The Payment class.
         instance: The payment record.
+        signal: post_save or post_delete.
     """
-    instance.sale.update_payment_status()
+    if kwargs.get('raw'):
+        return
+    
+    deltas = {}
+    if signal is post_delete:
+        deltas[instance.sale_id] = -instance.amount
+    else:
+        deltas[instance.sale_id] = instance.amount
+        previous = getattr(instance, '_previous_sale_amount', None)
+        if previous:
+            previous_sale_id, previous_amount = previous
+            if previous_sale_id == instance.sale_id:
+                deltas[instance.sale_id] -= previous_amount
+            else:
+                deltas[previous_sale_id] = -previous_amount
+    
+    pending = getattr(_deferred, 'deltas', None)
+    if pending is not None:
+        for sale_id, delta in deltas.items():
+            pending[sale_id] += delta
+        return
+    
+    for sale_id, delta in deltas.items():
+        if not delta:
+            continue
+        # The payment's own sale is usually already loaded; keep it in step.
+        sale = instance.sale if sale_id == instance.sale_id else Sale.all_objects.get(pk=sale_id)
+        _apply_payment_delta(sale, delta)
 
 
 @receiver(pre_save, sender=Sale)
-def track_sale_changes(sender, instance, **kwargs):
+def track_sale_changes(sender, instance, update_fields=None, **kwargs):
     """
     Record changes to sensitive Sale fields in the Audit Log.
     
@@ -38,27 +127,49 @@ def track_sale_changes(sender, instance, **kwargs):
         
     Triggered:
         Before Sale is saved.
+    
+    Sales loaded from the database carry their original values (see
+    Sale.from_db), so the comparison normally needs no query.
     """
+    fields_to_track = [
+        'customer_name', 'bottle_type', 'unit_price', 
+        'quantity', 'payment_status', 'is_wholesale'
+    ]
+    if update_fields is not None:
+        # Partial saves (e.g. soft_delete) only write the listed columns;
+        # when none of them are tracked there is nothing to diff.
+        fields_to_track = [field for field in fields_to_track if field in update_fields]
+        if not fields_to_track:
+            return
+    
     if instance.pk:
         try:
-            old_instance = Sale.objects.get(pk=instance.pk)
-            fields_to_track = [
-                'customer_name', 'bottle_type', 'unit_price', 
-                'quantity', 'payment_status', 'is_wholesale'
-            ]
+            loaded_values = getattr(instance, '_loaded_values', None)
+            if loaded_values is None:
+                old_instance = Sale.objects.get(pk=instance.pk)
+                loaded_values = old_instance._loaded_values
+            sale_content_type_id = ContentType.objects.get_for_model(Sale).pk
+            entries = []
             
             for field in fields_to_track:
-                old_value = str(getattr(old_instance, field))
-                new_value = str(getattr(instance, field))
+                if field not in loaded_values:
+                    continue
+                old_value = loaded_values[field]
+                new_value = getattr(instance, field)
                 
+                # Compare raw values; only changed ones are converted for storage
                 if old_value != new_value:
-                    AuditLog.objects.create(
-                        content_type=ContentType.objects.get_for_model(Sale),
+                    entries.append(AuditLog(
+                        content_type_id=sale_content_type_id,
                         object_id=instance.pk,
                         field_name=field,
-                        old_value=old_value,
-                        new_value=new_value,
-                        changed_by=instance.modified_by
-                    )
+                        old_value=str(old_value),
+                        new_value=str(new_value),
+                        changed_by_id=instance.modified_by_id
+                    ))
+            
+            # One INSERT for all changed fields
+            if entries:
+                AuditLog.objects.bulk_create(entries)
         except Sale.DoesNotExist:
             pass
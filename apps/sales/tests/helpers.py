@@ -0,0 +1,37 @@
+"""
+Shared fixtures for the sales test modules.
+
+Functions:
+- create_test_batch: Creates the stock batch sale fixtures point at.
+"""
+
+from decimal import Decimal
+
+from apps.batches.models import Batch
+
+
+def create_test_batch(user, batch_id=''):
+    """
+    Create the stock batch used by the sale fixtures.
+    
+    Called from each class's setUpTestData so the row is rolled back with
+    the class (module-level rows would outlive the test transaction).
+    
+    Args:
+        user (User): Recorded as the batch's creator and modifier.
+        batch_id (str): Label shown wherever the batch is displayed.
+    
+    Returns:
+        Batch: The saved batch.
+    """
+    return Batch.objects.create(
+        batch_id=batch_id,
+        supply_date='2026-01-01',
+        price=Decimal('10000.00'),
+        bottles_25cl=100,
+        bottles_75cl=50,
+        bottles_1L=30,
+        bottles_4L=10,
+        created_by=user,
+        modified_by=user
+    )
@@ -11,11 +11,12 @@ Test Categories:
 """
 
 from decimal import Decimal
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
 
+from apps.core.testing import FAST_PASSWORD_HASHERS
 from apps.sales.models import Sale
 from apps.batches.models import Batch
 from apps.customers.models import Customer
@@ -27,6 +28,7 @@ User = get_user_model()
 # SALE SUCCESS MESSAGE TESTS
 # =============================================================================
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class SaleCreateSuccessMessageTests(TestCase):
     """Test success messages for sale creation."""
     
@@ -127,6 +129,7 @@ class SaleCreateSuccessMessageTests(TestCase):
         self.assertContains(response, 'created successfully')
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class SaleUpdateSuccessMessageTests(TestCase):
     """Test success messages for sale updates."""
     
@@ -157,25 +160,27 @@ class SaleUpdateSuccessMessageTests(TestCase):
             created_by=cls.user,
             modified_by=cls.user
         )
-    
-    def setUp(self):
-        """Set up client and create sale for each test."""
-        self.client = Client()
-        self.client.login(email='saleupdate@example.com', password='testpass123')
         
-        self.sale = Sale.objects.create(
-            customer=self.customer,
+        # Each test's update is rolled back, so one sale serves the class.
+        # Tests only use its pk; refresh_from_db() before reading fields.
+        cls.sale = Sale.objects.create(
+            customer=cls.customer,
             customer_name='Update Customer',
             bottle_type='75CL',
             unit_price=Decimal('5000.00'),
             quantity=2,
             total_price=Decimal('10000.00'),
-            batch=self.batch,
+            batch=cls.batch,
             payment_status='UNPAID',
-            created_by=self.user,
-            modified_by=self.user
+            created_by=cls.user,
+            modified_by=cls.user
         )
     
+    def setUp(self):
+        """Set up client."""
+        self.client = Client()
+        self.client.login(email='saleupdate@example.com', password='testpass123')
+    
     def test_success_message_on_sale_update(self):
         """Test that success message is shown after updating a sale."""
         response = self.client.post(
@@ -253,6 +258,7 @@ class SaleUpdateSuccessMessageTests(TestCase):
         self.assertEqual(len(messages), 0)
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class SaleSuccessMessageEdgeCaseTests(TestCase):
     """Test edge cases for sale success messages."""
     
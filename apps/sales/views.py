@@ -6,6 +6,7 @@ This module manages the Sales workflow, including list, create, update, and spec
 Views:
 - SaleListView: browsable sales history.
 - SaleCreateView: POST entry for new sales.
+- HtmxSaleFormMixin: Partial re-render / HX-Redirect when the sale form submits over HTMX.
 - SaleArchiveView: Handles soft-deletion with reason capture.
 - PaymentCreateView: HTMX-powered modal for adding payments.
 """
@@ -15,7 +16,11 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, F
 from django.urls import reverse_lazy, reverse
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
-from django.http import HttpResponse
+from django.template.response import TemplateResponse
+from django.db.models import Prefetch
+from django_htmx.http import HttpResponseClientRedirect
+
+from apps.core.paginator import CountSkippingPaginator
 
 from .models import Sale, Payment
 from .forms import SaleForm, PaymentForm, ArchiveSaleForm
@@ -36,10 +41,18 @@ class SaleListView(LoginRequiredMixin, ListView):
     template_name = 'sales/sale_list.html'
     context_object_name = 'sales'
     paginate_by = 50
+    # Filtered results usually fit on one page; skip their COUNT(*)
+    paginator_class = CountSkippingPaginator
+    
+    # Columns sale_list.html renders; the template follows no relations.
+    list_fields = (
+        'id', 'sale_date', 'sale_time', 'customer_name', 'bottle_type',
+        'quantity', 'total_price', 'payment_status',
+    )
     
     def get_queryset(self):
         """Apply filters to the default queryset (which already excludes deleted items)."""
-        queryset = Sale.objects.all()
+        queryset = Sale.objects.only(*self.list_fields)
         
         # Filtering
         customer = self.request.GET.get('search')
@@ -53,7 +66,34 @@ class SaleListView(LoginRequiredMixin, ListView):
         return queryset
 
 
-class SaleCreateView(LoginRequiredMixin, CreateView):
+class HtmxSaleFormMixin:
+    """
+    Let the sale form submit over HTMX without full-page round trips.
+    
+    Logic:
+        - Invalid HTMX submit: render only the form fields partial, which
+          the form swaps into itself.
+        - Valid HTMX submit: answer with an HX-Redirect header, so the browser
+          loads the success page (and its flash message) itself.
+        - Plain form posts keep the normal page render and 302 redirect.
+    """
+    partial_template_name = 'sales/partials/sale_form_fields.html'
+    
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        if self.request.htmx:
+            return HttpResponseClientRedirect(response.url)
+        return response
+    
+    def form_invalid(self, form):
+        if self.request.htmx:
+            return TemplateResponse(
+                self.request, self.partial_template_name, self.get_context_data(form=form)
+            )
+        return super().form_invalid(form)
+
+
+class SaleCreateView(LoginRequiredMixin, HtmxSaleFormMixin, CreateView):
     """
     Create a new Sale.
     
@@ -81,9 +121,15 @@ class SaleDetailView(LoginRequiredMixin, DetailView):
     model = Sale
     template_name = 'sales/sale_detail.html'
     context_object_name = 'sale'
+    
+    def get_queryset(self):
+        """Join the customer and batch cards and load the payment history up front."""
+        return Sale.objects.select_related('customer', 'batch').prefetch_related(
+            Prefetch('payments', queryset=Payment.objects.order_by('-payment_date'))
+        )
 
 
-class SaleUpdateView(LoginRequiredMixin, UpdateView):
+class SaleUpdateView(LoginRequiredMixin, HtmxSaleFormMixin, UpdateView):
     """
     Evaluate and update a sale.
     
@@ -114,6 +160,7 @@ class SaleArchiveView(LoginRequiredMixin, FormView):
     """
     form_class = ArchiveSaleForm
     template_name = 'sales/sale_archive.html'
+    success_url = reverse_lazy('sales:list')
     
     def setup(self, request, *args, **kwargs):
         """Initialize the sale object from URL pk."""
@@ -130,7 +177,7 @@ class SaleArchiveView(LoginRequiredMixin, FormView):
         reason = form.cleaned_data['reason']
         self.sale.soft_delete(self.request.user, reason)
         messages.success(self.request, f"Sale #{self.sale.pk} archived successfully.")
-        return redirect('sales:list')
+        return super().form_valid(form)
 
 
 class SaleArchivedListView(LoginRequiredMixin, ListView):
@@ -144,9 +191,17 @@ class SaleArchivedListView(LoginRequiredMixin, ListView):
     context_object_name = 'sales'
     paginate_by = 50
     
+    # Columns sale_archived_list.html renders, plus who archived each sale
+    list_fields = (
+        'id', 'customer_name', 'total_price', 'deleted_at', 'deleted_reason',
+        'deleted_by', 'deleted_by__full_name', 'deleted_by__email',
+    )
+    
     def get_queryset(self):
-        """Use the custom 'archived' manager."""
-        return Sale.archived.all().order_by('-deleted_at')
+        """Use the custom 'archived' manager (newest first, served by sale_archived_idx)."""
+        return Sale.archived.select_related('deleted_by').only(
+            *self.list_fields
+        ).order_by('-deleted_at')
 
 
 class RestoreSaleView(LoginRequiredMixin, View):
@@ -207,7 +262,6 @@ class PaymentCreateView(LoginRequiredMixin, CreateView):
         payment.save()
         
         # Return updated payment list partial
-        from django.template.loader import render_to_string
-        return HttpResponse(
-            render_to_string('sales/partials/payment_list.html', {'sale': self.sale})
+        return TemplateResponse(
+            self.request, 'sales/partials/payment_list.html', {'sale': self.sale}
         )
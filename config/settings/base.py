@@ -56,6 +56,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', # Static file serving
+    # Compress page and HTMX partial responses. Below WhiteNoise, which answers
+    # static requests itself (precompressed files, Range support) before this runs.
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -74,8 +77,8 @@ TEMPLATES = [
         'DIRS': [BASE_DIR / 'templates'], # Global templates
         'APP_DIRS': True,
         'OPTIONS': {
+            # No 'debug' processor: no template uses debug/sql_queries
             'context_processors': [
-                'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
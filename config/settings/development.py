@@ -10,6 +10,11 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # On-disk test database so `manage.py test --keepdb` can reuse it
+        # (SQLite's default in-memory test database is rebuilt every run)
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
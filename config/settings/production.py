@@ -26,25 +26,13 @@ DATABASES = {
     )
 }
 
-# # Security settings
-# SECURE_SSL_REDIRECT = True
-# SESSION_COOKIE_SECURE = True
-# CSRF_COOKIE_SECURE = True
-# SECURE_HSTS_SECONDS = 31536000
-# SECURE_HSTS_INCLUDE_SUBDOMAINS = True
-# SECURE_HSTS_PRELOAD = True
-# SECURE_CONTENT_TYPE_NOSNIFF = True
-# SECURE_BROWSER_XSS_FILTER = True
-# X_FRAME_OPTIONS = 'DENY'
-# CSRF_COOKIE_HTTPONLY = True
-
-# # Static files with Whitenoise
-# STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
-
-# Static files - CRITICAL FIXES
-STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # This creates the directory
+# Static files (STATIC_URL/STATIC_ROOT come from base.py)
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# WhiteNoise already serves the hashed names this storage generates with a
+# far-future, immutable Cache-Control, so browsers never revalidate them.
+# Unhashed paths keep WhiteNoise's short default max-age (60s), since a
+# long cache can't be busted. With the brotli extra installed, collectstatic
+# also writes .br variants alongside .gz.
 
 # Media files
 MEDIA_URL = '/media/'
@@ -5,7 +5,26 @@ WSGI config for honey_mgmt project.
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 
+
+def warm_url_resolver():
+    """
+    Import every URLconf (and the views behind it) and build the resolver's
+    reverse/namespace tables while the worker boots, instead of on its first
+    request.
+    
+    Called here rather than in AppConfig.ready() so management commands and
+    tests don't pay for it.
+    
+    Returns:
+        MultiValueDict: The resolver's reverse table; reading it is what
+        populates the cached tables.
+    """
+    return get_resolver().reverse_dict
+
+
 application = get_wsgi_application()
+warm_url_resolver()
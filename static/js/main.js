@@ -5,8 +5,8 @@
 document.addEventListener('DOMContentLoaded', function () {
 
     // Auto-calculate total price in Sale form
-    const form = document.getElementById('sale-form');
-    if (form) {
+    // (re-run when HTMX swaps in the fields after a failed submit)
+    function initSaleTotal() {
         const unitPriceInput = document.getElementById('id_unit_price');
         const quantityInput = document.getElementById('id_quantity');
         const totalPriceDisplay = document.getElementById('total-price-display');
@@ -31,9 +31,14 @@ document.addEventListener('DOMContentLoaded', function () {
         if (unitPriceInput && quantityInput) {
             unitPriceInput.addEventListener('input', calculateTotal);
             quantityInput.addEventListener('input', calculateTotal);
+            calculateTotal();
         }
     }
 
+    if (document.getElementById('sale-form')) {
+        initSaleTotal();
+    }
+
     // Auto-dismiss alerts
     setTimeout(function () {
         const alerts = document.querySelectorAll('.alert-dismissible');
@@ -46,6 +51,14 @@ document.addEventListener('DOMContentLoaded', function () {
     // HTMX config
     document.body.addEventListener('htmx:configRequest', (event) => {
         event.detail.headers['X-CSRFToken'] = getCookie('csrftoken');
+
+        // HTMX serializes a form before its submit listeners below strip the
+        // thousand separators, so strip them from the request parameters too
+        event.detail.elt.querySelectorAll('.currency-input, .quantity-input').forEach(input => {
+            if (input.name in event.detail.parameters) {
+                event.detail.parameters[input.name] = parseFormattedNumber(input.value);
+            }
+        });
     });
 
     // ========================================
@@ -103,149 +116,164 @@ document.addEventListener('DOMContentLoaded', function () {
     }
 
     // Handle currency inputs (prices, costs, amounts)
-    const currencyInputs = document.querySelectorAll('.currency-input');
-    currencyInputs.forEach(input => {
-        // Store the raw value
-        let rawValue = parseFormattedNumber(input.value || '0');
-
-        // Format on blur
-        input.addEventListener('blur', function () {
-            const cleaned = cleanNumericInput(this.value, true);
-            if (cleaned === '' || cleaned === '.') {
-                rawValue = '';
-                this.value = '';
-            } else {
-                rawValue = cleaned;
-                this.value = formatNumber(cleaned, 2);
-            }
-        });
-
-        // Remove formatting on focus for easy editing
-        input.addEventListener('focus', function () {
-            const cleaned = parseFormattedNumber(this.value);
-            this.value = cleaned === '0' ? '' : cleaned;
-            this.select();
-        });
+    function initCurrencyInputs(root) {
+        root.querySelectorAll('.currency-input').forEach(input => {
+            // Store the raw value
+            let rawValue = parseFormattedNumber(input.value || '0');
+
+            // Format on blur
+            input.addEventListener('blur', function () {
+                const cleaned = cleanNumericInput(this.value, true);
+                if (cleaned === '' || cleaned === '.') {
+                    rawValue = '';
+                    this.value = '';
+                } else {
+                    rawValue = cleaned;
+                    this.value = formatNumber(cleaned, 2);
+                }
+            });
 
-        // Clean input in real-time (prevent alphabets)
-        input.addEventListener('input', function (e) {
-            const cursorPos = this.selectionStart;
-            const oldValue = this.value;
-            const cleaned = cleanNumericInput(this.value, true);
+            // Remove formatting on focus for easy editing
+            input.addEventListener('focus', function () {
+                const cleaned = parseFormattedNumber(this.value);
+                this.value = cleaned === '0' ? '' : cleaned;
+                this.select();
+            });
 
-            if (oldValue !== cleaned) {
-                this.value = cleaned;
-                // Restore cursor position
-                this.setSelectionRange(cursorPos - 1, cursorPos - 1);
-            }
-        });
+            // Clean input in real-time (prevent alphabets)
+            input.addEventListener('input', function (e) {
+                const cursorPos = this.selectionStart;
+                const oldValue = this.value;
+                const cleaned = cleanNumericInput(this.value, true);
+
+                if (oldValue !== cleaned) {
+                    this.value = cleaned;
+                    // Restore cursor position
+                    this.setSelectionRange(cursorPos - 1, cursorPos - 1);
+                }
+            });
 
-        // Validate input in real-time
-        input.addEventListener('keydown', function (e) {
-            // Allow: backspace, delete, tab, escape, enter
-            if ([8, 9, 27, 13, 46].indexOf(e.keyCode) !== -1 ||
-                // Allow: Ctrl+A, Ctrl+C, Ctrl+V, Ctrl+X
-                (e.keyCode === 65 && e.ctrlKey === true) ||
-                (e.keyCode === 67 && e.ctrlKey === true) ||
-                (e.keyCode === 86 && e.ctrlKey === true) ||
-                (e.keyCode === 88 && e.ctrlKey === true) ||
-                // Allow: home, end, left, right
-                (e.keyCode >= 35 && e.keyCode <= 39)) {
-                return;
-            }
+            // Validate input in real-time
+            input.addEventListener('keydown', function (e) {
+                // Allow: backspace, delete, tab, escape, enter
+                if ([8, 9, 27, 13, 46].indexOf(e.keyCode) !== -1 ||
+                    // Allow: Ctrl+A, Ctrl+C, Ctrl+V, Ctrl+X
+                    (e.keyCode === 65 && e.ctrlKey === true) ||
+                    (e.keyCode === 67 && e.ctrlKey === true) ||
+                    (e.keyCode === 86 && e.ctrlKey === true) ||
+                    (e.keyCode === 88 && e.ctrlKey === true) ||
+                    // Allow: home, end, left, right
+                    (e.keyCode >= 35 && e.keyCode <= 39)) {
+                    return;
+                }
+
+                // Ensure it's a number or decimal point
+                if ((e.shiftKey || (e.keyCode < 48 || e.keyCode > 57)) &&
+                    (e.keyCode < 96 || e.keyCode > 105) &&
+                    e.keyCode !== 190 && e.keyCode !== 110) {
+                    e.preventDefault();
+                }
+
+                // Prevent multiple decimal points
+                if ((e.keyCode === 190 || e.keyCode === 110) && this.value.indexOf('.') !== -1) {
+                    e.preventDefault();
+                }
+            });
 
-            // Ensure it's a number or decimal point
-            if ((e.shiftKey || (e.keyCode < 48 || e.keyCode > 57)) &&
-                (e.keyCode < 96 || e.keyCode > 105) &&
-                e.keyCode !== 190 && e.keyCode !== 110) {
+            // Handle paste events
+            input.addEventListener('paste', function (e) {
                 e.preventDefault();
-            }
+                const pastedText = (e.clipboardData || window.clipboardData).getData('text');
+                const cleaned = cleanNumericInput(pastedText, true);
+                this.value = cleaned;
+            });
 
-            // Prevent multiple decimal points
-            if ((e.keyCode === 190 || e.keyCode === 110) && this.value.indexOf('.') !== -1) {
-                e.preventDefault();
+            // Initial formatting
+            if (input.value) {
+                input.value = formatNumber(parseFormattedNumber(input.value), 2);
             }
         });
-
-        // Handle paste events
-        input.addEventListener('paste', function (e) {
-            e.preventDefault();
-            const pastedText = (e.clipboardData || window.clipboardData).getData('text');
-            const cleaned = cleanNumericInput(pastedText, true);
-            this.value = cleaned;
-        });
-
-        // Initial formatting
-        if (input.value) {
-            input.value = formatNumber(parseFormattedNumber(input.value), 2);
-        }
-    });
+    }
 
     // Handle quantity inputs (integers only)
-    const quantityInputs = document.querySelectorAll('.quantity-input');
-    quantityInputs.forEach(input => {
-        // Format on blur
-        input.addEventListener('blur', function () {
-            const cleaned = cleanNumericInput(this.value, false);
-            if (cleaned === '') {
-                this.value = '';
-            } else {
-                this.value = formatNumber(cleaned, 0);
-            }
-        });
-
-        // Remove formatting on focus
-        input.addEventListener('focus', function () {
-            const cleaned = parseFormattedNumber(this.value);
-            this.value = cleaned === '0' ? '' : cleaned;
-            this.select();
-        });
+    function initQuantityInputs(root) {
+        root.querySelectorAll('.quantity-input').forEach(input => {
+            // Format on blur
+            input.addEventListener('blur', function () {
+                const cleaned = cleanNumericInput(this.value, false);
+                if (cleaned === '') {
+                    this.value = '';
+                } else {
+                    this.value = formatNumber(cleaned, 0);
+                }
+            });
 
-        // Clean input in real-time (prevent alphabets)
-        input.addEventListener('input', function (e) {
-            const cursorPos = this.selectionStart;
-            const oldValue = this.value;
-            const cleaned = cleanNumericInput(this.value, false);
+            // Remove formatting on focus
+            input.addEventListener('focus', function () {
+                const cleaned = parseFormattedNumber(this.value);
+                this.value = cleaned === '0' ? '' : cleaned;
+                this.select();
+            });
 
-            if (oldValue !== cleaned) {
-                this.value = cleaned;
-                // Restore cursor position
-                this.setSelectionRange(cursorPos - 1, cursorPos - 1);
-            }
-        });
+            // Clean input in real-time (prevent alphabets)
+            input.addEventListener('input', function (e) {
+                const cursorPos = this.selectionStart;
+                const oldValue = this.value;
+                const cleaned = cleanNumericInput(this.value, false);
+
+                if (oldValue !== cleaned) {
+                    this.value = cleaned;
+                    // Restore cursor position
+                    this.setSelectionRange(cursorPos - 1, cursorPos - 1);
+                }
+            });
 
-        // Validate input - integers only
-        input.addEventListener('keydown', function (e) {
-            // Allow: backspace, delete, tab, escape, enter
-            if ([8, 9, 27, 13, 46].indexOf(e.keyCode) !== -1 ||
-                // Allow: Ctrl+A, Ctrl+C, Ctrl+V, Ctrl+X
-                (e.keyCode === 65 && e.ctrlKey === true) ||
-                (e.keyCode === 67 && e.ctrlKey === true) ||
-                (e.keyCode === 86 && e.ctrlKey === true) ||
-                (e.keyCode === 88 && e.ctrlKey === true) ||
-                // Allow: home, end, left, right
-                (e.keyCode >= 35 && e.keyCode <= 39)) {
-                return;
-            }
+            // Validate input - integers only
+            input.addEventListener('keydown', function (e) {
+                // Allow: backspace, delete, tab, escape, enter
+                if ([8, 9, 27, 13, 46].indexOf(e.keyCode) !== -1 ||
+                    // Allow: Ctrl+A, Ctrl+C, Ctrl+V, Ctrl+X
+                    (e.keyCode === 65 && e.ctrlKey === true) ||
+                    (e.keyCode === 67 && e.ctrlKey === true) ||
+                    (e.keyCode === 86 && e.ctrlKey === true) ||
+                    (e.keyCode === 88 && e.ctrlKey === true) ||
+                    // Allow: home, end, left, right
+                    (e.keyCode >= 35 && e.keyCode <= 39)) {
+                    return;
+                }
+
+                // Ensure it's a number only (no decimals)
+                if ((e.shiftKey || (e.keyCode < 48 || e.keyCode > 57)) &&
+                    (e.keyCode < 96 || e.keyCode > 105)) {
+                    e.preventDefault();
+                }
+            });
 
-            // Ensure it's a number only (no decimals)
-            if ((e.shiftKey || (e.keyCode < 48 || e.keyCode > 57)) &&
-                (e.keyCode < 96 || e.keyCode > 105)) {
+            // Handle paste events
+            input.addEventListener('paste', function (e) {
                 e.preventDefault();
+                const pastedText = (e.clipboardData || window.clipboardData).getData('text');
+                const cleaned = cleanNumericInput(pastedText, false);
+                this.value = cleaned;
+            });
+
+            // Initial formatting
+            if (input.value) {
+                input.value = formatNumber(parseFormattedNumber(input.value), 0);
             }
         });
+    }
 
-        // Handle paste events
-        input.addEventListener('paste', function (e) {
-            e.preventDefault();
-            const pastedText = (e.clipboardData || window.clipboardData).getData('text');
-            const cleaned = cleanNumericInput(pastedText, false);
-            this.value = cleaned;
-        });
+    initCurrencyInputs(document);
+    initQuantityInputs(document);
 
-        // Initial formatting
-        if (input.value) {
-            input.value = formatNumber(parseFormattedNumber(input.value), 0);
+    // The sale form swaps its own fields on an HTMX validation error;
+    // bind the fresh inputs like the ones present at page load
+    document.body.addEventListener('htmx:afterSwap', (event) => {
+        if (event.detail.target.id === 'sale-form') {
+            initCurrencyInputs(event.detail.target);
+            initQuantityInputs(event.detail.target);
+            initSaleTotal();
         }
     });
 